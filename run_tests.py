@@ -2,9 +2,15 @@ import os
 import re
 import shutil
 import subprocess
-from pathlib import Path
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import csv
+import functools
+import json
+import queue
+import xml.etree.ElementTree as ET
 
 # Color codes for terminal output
 class Colors:
@@ -14,23 +20,70 @@ class Colors:
     YELLOW = '\033[0;33m'  # Added yellow for FAILED_TO_RUN status
     NC = '\033[0m'  # No color
 
+# Escape codes only mean something on a terminal; keep redirected logs clean
+if not sys.stdout.isatty():
+    for _name in ('GREEN', 'RED', 'BLUE', 'YELLOW', 'NC'):
+        setattr(Colors, _name, '')
+
 # Directory structure constants
 CODE_DIR = "code"
 TEST_DIR = "test"
 RESULTS_DIR = "test_results"
+WORKSPACES_DIR = "workspaces"
+
+# Gradle project layout, relative to each workspace
 SRC_MAIN = "src/main/java"
 SRC_TEST = "src/test/java"
 BUILD_GRADLE_FILE = "build.gradle"
+GRADLE_PROPERTIES_FILE = "gradle.properties"
+GRADLE_LOG_FILE = "gradle.log"
+MAIN_CLASSES_DIR = "build/classes/java/main"
+TEST_CLASSES_DIR = "build/classes/java/test"
+TEST_REPORTS_DIR = "build/test-results/test"
+JACOCO_CSV_FILE = "build/reports/jacoco/test/jacocoTestReport.csv"
 COVERAGE_FILE = os.path.join(RESULTS_DIR, "coverage.txt")
+SUMMARY_FILE = os.path.join(RESULTS_DIR, "summary.txt")
+SUMMARY_JSON_FILE = os.path.join(RESULTS_DIR, "summary.json")
+
+# One Gradle worker per physical core; each test JVM is multi-threaded
+# itself, so scheduling one per logical core only oversubscribes the CPU
+GRADLE_MAX_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+
+# Code files are tested concurrently, each build in its own reusable
+# workspace. Every concurrent build runs its own daemon JVM, so the count
+# is capped to bound memory, and the worker budget is split between them.
+PARALLEL_BUILDS = min(4, GRADLE_MAX_WORKERS)
+BUILD_MAX_WORKERS = max(1, GRADLE_MAX_WORKERS // PARALLEL_BUILDS)
+
+# Patterns used while rewriting candidate sources, compiled once per run
+_VIS_ALL = re.compile(r'\b(?:private|protected)\s+(?:(final\s+static)|(static))?')
+_PUBLIC_CLASS_RE = re.compile(r'public class (\w+)')
+
+# Directories never searched for sources: build output, tool caches, VCS
+_PRUNED_DIRS = frozenset({"build", ".gradle", ".ropeproject", ".git"})
+
+# Model bucket for single-letter code files, keyed by upper-cased letter
+_BUCKET = {letter: 'claude' for letter in 'ABCDE'}
+_BUCKET.update({letter: 'llama' for letter in 'FGHIJ'})
+
+def model_bucket(file_name):
+    """Summary bucket for a code file: 'claude', 'llama' or 'other'."""
+    name = os.path.basename(file_name)
+    # Single-letter files (case insensitive) map to a model by their letter
+    if len(name) == 6 and name[1:] == '.java' and name[0].isalpha():
+        return _BUCKET.get(name[0].upper(), 'other')
+    return 'other'
 
 class TestResult:
     def __init__(self, file_name):
         self.file_name = file_name
+        self.category = model_bucket(file_name)  # Summary bucket, fixed by the name
         self.status = "NOT_RUN"
-        self.output = ""
+        self.log_file = None  # Gradle output, streamed to disk instead of kept in memory
         self.error = None
-        self.timestamp = datetime.now()
+        self.timestamp = None  # Filled in when the result is saved
         self.coverage = None
+        self.test_counts = None  # Totals from the JUnit XML reports
 
 class CoverageMetrics:
     def __init__(self):
@@ -49,8 +102,49 @@ class CoverageMetrics:
         self.total_branches = 0
         self.covered_branches = 0
 
-def parse_jacoco_csv():
-    coverage_file = "build/reports/jacoco/test/jacocoTestReport.csv"
+def parse_junit_results(work_dir):
+    """Sum the suite totals from Gradle's JUnit XML reports.
+
+    Returns None when no report was written, e.g. when the tests never ran.
+    """
+    reports_dir = os.path.join(work_dir, TEST_REPORTS_DIR)
+    if not os.path.isdir(reports_dir):
+        return None
+
+    counts = {'tests': 0, 'failures': 0, 'errors': 0, 'skipped': 0}
+    found = False
+    with os.scandir(reports_dir) as it:
+        for entry in it:
+            if not (entry.name.startswith('TEST-') and entry.name.endswith('.xml')):
+                continue
+            # Totals are attributes of the root <testsuite>, so stop at its start tag
+            with open(entry.path, 'rb') as f:
+                _, suite = next(ET.iterparse(f, events=('start',)))
+            for key in counts:
+                counts[key] += int(suite.get(key, 0))
+            found = True
+    return counts if found else None
+
+def collect_junit_failures(work_dir):
+    """List 'Class.test: message' for every failed or errored test case."""
+    failures = []
+    with os.scandir(os.path.join(work_dir, TEST_REPORTS_DIR)) as it:
+        for entry in it:
+            if not (entry.name.startswith('TEST-') and entry.name.endswith('.xml')):
+                continue
+            for _, case in ET.iterparse(entry.path, events=('end',)):
+                if case.tag != 'testcase':
+                    continue
+                for problem in case:
+                    if problem.tag in ('failure', 'error'):
+                        message = problem.get('message') or problem.get('type', problem.tag)
+                        failures.append(f"{case.get('classname')}.{case.get('name')}: {message}")
+                # Drop the parsed case so large <system-out> blocks don't pile up
+                case.clear()
+    return failures
+
+def parse_jacoco_csv(work_dir):
+    coverage_file = os.path.join(work_dir, JACOCO_CSV_FILE)
     if not os.path.exists(coverage_file):
         return None
 
@@ -61,18 +155,27 @@ def parse_jacoco_csv():
         'lines': {'covered': 0, 'missed': 0}
     }
     
-    with open(coverage_file, 'r') as f:
-        reader = csv.DictReader(f)
+    with open(coverage_file, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        # Look the columns up once instead of building a dict per row
+        header = next(reader, None)
+        if header is None:
+            return None
+        class_col = header.index('CLASS')
+        columns = [
+            (total_metrics['instructions'], 'covered', header.index('INSTRUCTION_COVERED')),
+            (total_metrics['instructions'], 'missed', header.index('INSTRUCTION_MISSED')),
+            (total_metrics['branches'], 'covered', header.index('BRANCH_COVERED')),
+            (total_metrics['branches'], 'missed', header.index('BRANCH_MISSED')),
+            (total_metrics['lines'], 'covered', header.index('LINE_COVERED')),
+            (total_metrics['lines'], 'missed', header.index('LINE_MISSED')),
+        ]
         for row in reader:
             # Include coverage for all classes in the package
-            if not row['CLASS'].startswith('org.junit') and not row['CLASS'].startswith('org.mockito'):
+            if not row[class_col].startswith(('org.junit', 'org.mockito')):
                 # Accumulate coverage data
-                total_metrics['instructions']['covered'] += int(row['INSTRUCTION_COVERED'])
-                total_metrics['instructions']['missed'] += int(row['INSTRUCTION_MISSED'])
-                total_metrics['branches']['covered'] += int(row['BRANCH_COVERED'])
-                total_metrics['branches']['missed'] += int(row['BRANCH_MISSED'])
-                total_metrics['lines']['covered'] += int(row['LINE_COVERED'])
-                total_metrics['lines']['missed'] += int(row['LINE_MISSED'])
+                for totals, key, col in columns:
+                    totals[key] += int(row[col])
     
     # Calculate total coverage metrics
     total_instructions = total_metrics['instructions']['covered'] + total_metrics['instructions']['missed']
@@ -122,20 +225,54 @@ def calculate_overall_coverage(test_results):
     
     return metrics
 
-def cleanup():
-    print(f"{Colors.BLUE}Cleaning up build and src directories...{Colors.NC}")
-    for directory in ["build", "src", ".gradle", "gradle", ".ropeproject"]:
+def discard_directory(directory):
+    """Remove a directory tree without waiting for the deletion to finish."""
+    if not os.path.isdir(directory):
+        return
+    if os.name == 'nt':
         shutil.rmtree(directory, ignore_errors=True)
-    for file in ["gradlew", "gradlew.bat", BUILD_GRADLE_FILE]:
-        if os.path.exists(file):
-            os.remove(file)
+        return
+    # Renaming is a single metadata operation, so the name is free again
+    # immediately while rm reclaims the tree in the background
+    trash = f"{directory}.{uuid.uuid4().hex}.trash"
+    try:
+        os.rename(directory, trash)
+    except OSError:
+        shutil.rmtree(directory, ignore_errors=True)
+        return
+    subprocess.Popen(["rm", "-rf", trash], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def cleanup():
+    print(f"{Colors.BLUE}Cleaning up Gradle workspaces...{Colors.NC}")
+    discard_directory(WORKSPACES_DIR)
+
+def _scandir_java(root):
+    # Prune build output directories once per directory rather than
+    # filtering every file path that lives under them. An explicit stack
+    # keeps deep trees clear of the recursion limit and of nested generators.
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            # Unreadable, vanished mid-walk or not a directory after all:
+            # skip it rather than abort discovery
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in _PRUNED_DIRS:
+                        continue
+                    stack.append(entry.path)
+                # Symlinked sources count, as they did with rglob; only
+                # symlinked directories are left unfollowed
+                elif entry.is_file() and entry.name.endswith(".java"):
+                    yield entry.path
 
 def find_java_files(directory):
-    java_files = []
-    for file_path in Path(directory).rglob("*.java"):
-        if "build" not in str(file_path) and ".gradle" not in str(file_path):
-            java_files.append(str(file_path))
-    return java_files
+    # scandir order is filesystem-dependent; sort once here so runs and
+    # reports list the files in a stable order
+    return sorted(_scandir_java(directory))
 
 def find_test_files():
     return find_java_files(TEST_DIR)
@@ -145,75 +282,173 @@ def find_code_files():
 
 def check_test_convention(test_file):
     """Check if test file references Solution or Main"""
-    with open(test_file, 'r') as f:
+    # A bytes search needs no decode; 'Solution' is ASCII, so it matches
+    # exactly where it would in the UTF-8 text
+    with open(test_file, 'rb') as f:
         content = f.read()
-    return 'Solution' in content
+    return b'Solution' in content
+
+def _public_modifier(match):
+    # 'final static' is normalised to 'static final'; any whitespace after
+    # the matched keywords is left in place
+    if match.group(1):
+        return 'public static final'
+    if match.group(2):
+        return 'public static'
+    return 'public '
 
 def process_java_file(file_path, use_solution):
-    with open(file_path, 'r') as f:
+    with open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
     
     target_class = "Solution" if use_solution else "Main"
-    
-    # Find all unique class names in the file
-    class_pattern = r'(?:class|new|throws|extends|implements|\w+\s+)[\s\n]*(\w+)(?=[\s\n]*[{(\s])'
-    class_names = set(re.findall(class_pattern, content))
-    keywords = {'String', 'Integer', 'Boolean', 'Double', 'Float', 'List', 'Map', 'Set', 'Exception'}
-    class_names = {name for name in class_names if name not in keywords}
-    
+    return transform_source(content, target_class)
+
+# Keyed on the source text, so code files with identical contents (e.g. the
+# same response saved under two names) are only rewritten once
+@functools.lru_cache(maxsize=256)
+def transform_source(content, target_class):
     # Change protected/private to public
-    content = re.sub(r'\b(private|protected)\s+static', 'public static', content)
-    content = re.sub(r'\b(private|protected)\s+final\s+static', 'public static final', content)
-    content = re.sub(r'\b(private|protected)\s+', 'public ', content)
+    content = _VIS_ALL.sub(_public_modifier, content)
     
     # Get the main class name and replace it
-    main_class = re.search(r'public class (\w+)', content).group(1)
-    content = re.sub(f'(?<!new )\\b{main_class}\\b', target_class, content)
-    content = re.sub(f'new {main_class}\\(', f'new {target_class}(', content)
-    
-    return content
-
-def setup_test_environment(code_file, test_files):
-    # Create necessary directories
-    os.makedirs(SRC_MAIN, exist_ok=True)
-    os.makedirs(SRC_TEST, exist_ok=True)
-
+    main_class = _PUBLIC_CLASS_RE.search(content).group(1)
+    if main_class == target_class:
+        # Already named as the tests expect; renaming would be a no-op pass
+        return content
+    return rename_class(content, main_class, target_class)
+
+def _is_word_char(char):
+    # Same definition of a word character as \w in a str regex
+    return char.isalnum() or char == '_'
+
+@functools.lru_cache(maxsize=128)
+def _rename_pattern(old_name):
+    old_name = re.escape(old_name)
+    return re.compile(rf'(?<!new )\b{old_name}\b|(?<=new ){old_name}(?=\()')
+
+def rename_class(content, old_name, new_name):
+    """Replace whole-word references to old_name with new_name.
+
+    Occurrences preceded by 'new ' are only renamed when they are
+    constructor calls, i.e. directly followed by '('.
+    """
+    if not old_name.isidentifier():
+        return _rename_pattern(old_name).sub(new_name, content)
+
+    # Splitting on the name and checking the characters around each split
+    # point does the same job as the regex above in one linear pass
+    parts = content.split(old_name)
+    out = [parts[0]]
+    length = len(old_name)
+    pos = len(parts[0])
+    for part in parts[1:]:
+        end = pos + length
+        after = content[end:end + 1]
+        if pos >= 4 and content[pos - 4:pos] == 'new ':
+            replace = after == '('
+        else:
+            replace = ((pos == 0 or not _is_word_char(content[pos - 1]))
+                       and not (after and _is_word_char(after)))
+        out.append(new_name if replace else old_name)
+        out.append(part)
+        pos = end + len(part)
+    return ''.join(out)
+
+def link_or_copy(src, dst):
+    """Hardlink src to dst, copying instead when linking isn't possible."""
+    # Unlink first: writing into an existing hardlinked dst would modify
+    # the original file it shares an inode with
+    try:
+        os.remove(dst)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(src, dst)
+    except OSError:
+        # Gradle only needs the bytes; copy2's permission and timestamp
+        # copying is wasted syscalls
+        shutil.copyfile(src, dst)
+
+def setup_test_environment(test_files, work_dirs):
+    """Lay out one Gradle project per workspace, each reused across code files.
+
+    Returns whether the tests target Solution (True) or Main (False).
+    """
     # Check test file convention
     uses_solution = check_test_convention(test_files[0])
     target_class = "Solution" if uses_solution else "Main"
 
-    # Process and copy the main code file
+    for test_file in test_files:
+        print(f"\nCopying test file: {test_file}")
+
+    for work_dir in work_dirs:
+        # Create necessary directories
+        os.makedirs(os.path.join(work_dir, SRC_MAIN), exist_ok=True)
+        os.makedirs(os.path.join(work_dir, SRC_TEST), exist_ok=True)
+
+        # Copy test files with appropriate name
+        for test_file in test_files:
+            test_file_name = f"{target_class}Test.java"
+            test_file_path = os.path.join(work_dir, SRC_TEST, test_file_name)
+            link_or_copy(test_file, test_file_path)
+
+        create_build_gradle(work_dir)
+
+    # Generate the wrapper once and give every other workspace a copy;
+    # copy2 keeps gradlew's executable bit
+    create_gradle_wrapper(work_dirs[0])
+    for work_dir in work_dirs[1:]:
+        for script in ["gradlew", "gradlew.bat"]:
+            script_path = os.path.join(work_dirs[0], script)
+            if os.path.exists(script_path):
+                shutil.copy2(script_path, os.path.join(work_dir, script))
+        shutil.copytree(os.path.join(work_dirs[0], "gradle"), os.path.join(work_dir, "gradle"))
+    return uses_solution
+
+def install_code_file(code_file, uses_solution, work_dir):
+    target_class = "Solution" if uses_solution else "Main"
+
+    # Process and copy the main code file; this is the only source that
+    # changes between code files
     print(f"\nProcessing main code file: {code_file}")
     main_content = process_java_file(code_file, uses_solution)
-    main_file_path = os.path.join(SRC_MAIN, f"{target_class}.java")
-    with open(main_file_path, 'w') as f:
+    main_file_path = os.path.join(work_dir, SRC_MAIN, f"{target_class}.java")
+    with open(main_file_path, 'w', encoding='utf-8') as f:
         f.write(main_content)
 
-    # Copy test files with appropriate name
-    for test_file in test_files:
-        print(f"\nCopying test file: {test_file}")
-        test_file_name = f"{target_class}Test.java"
-        test_file_path = os.path.join(SRC_TEST, test_file_name)
-        shutil.copy2(test_file, test_file_path)
-
-def save_coverage_report(test_results):
-    with open(COVERAGE_FILE, 'w') as f:
-        f.write("Code Coverage Report\n")
-        f.write("===================\n\n")
-        f.write(f"Generated: {datetime.now()}\n\n")
+def timestamp_now():
+    # Second resolution is all the reports need; isoformat skips the
+    # generic str() formatting path
+    return datetime.now().isoformat(sep=' ', timespec='seconds')
+
+def write_report(path, text):
+    """Replace path with text so readers never see a half-written report."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+def save_coverage_report(test_results, run_timestamp):
+    overall_metrics = calculate_overall_coverage(test_results)
+    report = (
+        "Code Coverage Report\n"
+        "===================\n\n"
+        f"Generated: {run_timestamp}\n\n"
         
         # Add overall coverage section
-        overall_metrics = calculate_overall_coverage(test_results)
-        f.write("Overall Coverage Metrics:\n")
-        f.write("------------------------\n")
-        f.write(f"Overall Coverage: {overall_metrics['overall_coverage']:.2f}%\n")
-        f.write(f"Total Instruction Coverage: {overall_metrics['instruction_coverage']:.2f}%\n")
-        f.write(f"Total Branch Coverage: {overall_metrics['branch_coverage']:.2f}%\n")
-        f.write(f"Total Line Coverage: {overall_metrics['line_coverage']:.2f}%\n\n")
-        
+        "Overall Coverage Metrics:\n"
+        "------------------------\n"
+        f"Overall Coverage: {overall_metrics['overall_coverage']:.2f}%\n"
+        f"Total Instruction Coverage: {overall_metrics['instruction_coverage']:.2f}%\n"
+        f"Total Branch Coverage: {overall_metrics['branch_coverage']:.2f}%\n"
+        f"Total Line Coverage: {overall_metrics['line_coverage']:.2f}%\n\n"
+    )
+    write_report(COVERAGE_FILE, report)
+
 def run_tests():
-    code_files = find_java_files(CODE_DIR)
-    test_files = find_java_files(TEST_DIR)
+    code_files = find_code_files()
+    test_files = find_test_files()
     test_results = []
 
     if not code_files:
@@ -226,153 +461,231 @@ def run_tests():
 
     print(f"{Colors.GREEN}Found {len(code_files)} code files and {len(test_files)} test files{Colors.NC}")
 
-    for code_file in code_files:
-        print(f"\n{Colors.BLUE}Testing {code_file}{Colors.NC}")
-        
-        test_result = TestResult(code_file)
-        
+    # Each workspace is a Gradle project reused by every code file it is
+    # handed, so dependencies are resolved and the tests compiled once per
+    # workspace; a code file only swaps in its main source and reruns the
+    # test task. Gradle does the work, so threads are enough to overlap builds.
+    work_dirs = [os.path.join(WORKSPACES_DIR, f"worker{i}")
+                 for i in range(min(PARALLEL_BUILDS, len(code_files)))]
+    cleanup()
+    try:
+        uses_solution = setup_test_environment(test_files, work_dirs)
+        setup_error = None
+    except Exception as e:
+        uses_solution = None
+        setup_error = e
+        print(f"{Colors.YELLOW}Failed to set up the Gradle project: {e}{Colors.NC}")
+
+    idle_workspaces = queue.Queue()
+    for work_dir in work_dirs:
+        idle_workspaces.put(work_dir)
+
+    def run_in_workspace(code_file):
+        work_dir = idle_workspaces.get()
+        try:
+            return test_code_file(code_file, uses_solution, work_dir, setup_error)
+        except Exception as e:
+            # Anything test_code_file didn't handle itself (e.g. saving the
+            # result) fails this file only; raised out of map() it would
+            # abort the sweep before any summary is written
+            test_result = TestResult(code_file)
+            test_result.status = "FAILED_TO_RUN"
+            test_result.error = str(e)
+            print(f"{Colors.YELLOW}Failed to run tests for {code_file}: {e}{Colors.NC}")
+            return test_result
+        finally:
+            idle_workspaces.put(work_dir)
+
+    try:
+        # map() keeps the results in code file order whatever order they finish in
+        with ThreadPoolExecutor(max_workers=len(work_dirs)) as executor:
+            test_results = list(executor.map(run_in_workspace, code_files))
+    finally:
+        # The workspaces hold whole Gradle builds; never leave them behind
         cleanup()
+    return test_results
+
+def test_code_file(code_file, uses_solution, work_dir, setup_error=None):
+    print(f"\n{Colors.BLUE}Testing {code_file}{Colors.NC}")
+    
+    test_result = TestResult(code_file)
+    
+    try:
+        if setup_error is not None:
+            raise setup_error
+
+        install_code_file(code_file, uses_solution, work_dir)
+        target_class = "Solution" if uses_solution else "Main"
+        class_files = [
+            os.path.join(work_dir, MAIN_CLASSES_DIR, f"{target_class}.class"),
+            # The tests compile against the candidate, so a missing method
+            # shows up as a test compile failure
+            os.path.join(work_dir, TEST_CLASSES_DIR, f"{target_class}Test.class"),
+        ]
         
-        try:
-            setup_test_environment(code_file, test_files)
-            create_build_gradle()
-            
-            gradle_result = run_gradle(capture_output=True)
-            test_result.output = gradle_result.stdout + gradle_result.stderr
-            
-            if 'compileJava FAILED' in test_result.output or 'error:' in test_result.output:
-                test_result.status = "FAILED_TO_RUN"
+        # Drop the previous code file's outputs so they can't be mistaken for
+        # this run's: coverage in case jacocoTestReport doesn't run, and the
+        # class files, whose absence afterwards is how a compile failure shows
+        shutil.rmtree(os.path.join(work_dir, TEST_REPORTS_DIR), ignore_errors=True)
+        for stale_file in [os.path.join(work_dir, JACOCO_CSV_FILE)] + class_files:
+            try:
+                os.remove(stale_file)
+            except FileNotFoundError:
+                pass
+        test_result.log_file = os.path.join(work_dir, GRADLE_LOG_FILE)
+        gradle_result = run_gradle(work_dir)
+        counts = parse_junit_results(work_dir)
+        test_result.test_counts = counts
+        
+        if counts is None and gradle_result.returncode != 0:
+            # Gradle stops before 'test' when compilation fails, so no
+            # reports means nothing ran; the class files tell whether javac
+            # rejected the candidate or its tests
+            test_result.status = "FAILED_TO_RUN"
+            if not all(os.path.exists(class_file) for class_file in class_files):
                 test_result.error = "Compilation failed"
-            elif gradle_result.returncode == 0:
+            else:
+                test_result.error = f"Tests did not run, Gradle exited with return code: {gradle_result.returncode}"
+        else:
+            # The JUnit reports are authoritative; a clean exit with none
+            # means there were no tests to fail
+            failed_tests = counts['failures'] + counts['errors'] if counts is not None else 0
+            passed = failed_tests == 0
+
+            if passed:
                 test_result.status = "PASSED"
                 # Parse coverage metrics after successful test run
-                test_result.coverage = parse_jacoco_csv()
+                test_result.coverage = parse_jacoco_csv(work_dir)
                 print(f"{Colors.GREEN}Successfully tested {code_file}{Colors.NC}")
             else:
                 test_result.status = "FAILED"
-                test_result.error = f"Tests failed with return code: {gradle_result.returncode}"
+                test_result.error = "\n".join(
+                    [f"{failed_tests} of {counts['tests']} tests failed"]
+                    + collect_junit_failures(work_dir))
                 print(f"{Colors.RED}Tests failed for {code_file}{Colors.NC}")
-                
-        except Exception as e:
-            test_result.status = "FAILED_TO_RUN"
-            test_result.error = str(e)
-            print(f"{Colors.YELLOW}Failed to run tests for {code_file}: {e}{Colors.NC}")
-        
-        save_test_result(test_result)
-        test_results.append(test_result)
-        cleanup()
+            
+    except Exception as e:
+        test_result.status = "FAILED_TO_RUN"
+        test_result.error = str(e)
+        print(f"{Colors.YELLOW}Failed to run tests for {code_file}: {e}{Colors.NC}")
     
-    return test_results
+    # Saved before the workspace is handed on, while its log is still this file's
+    save_test_result(test_result)
+    return test_result
 
 def save_test_result(test_result):
-    # Create results directory if it doesn't exist
-    os.makedirs(RESULTS_DIR, exist_ok=True)
+    # RESULTS_DIR is created once by main() before any test runs
     
     # Save individual test result
     file_name = os.path.basename(test_result.file_name)
-    result_file = os.path.join(RESULTS_DIR, f"{file_name.split('.java')[0]}.txt")
+    stem = os.path.splitext(file_name)[0]
+    result_file = os.path.join(RESULTS_DIR, f"{stem}.txt")
     
-    with open(result_file, 'w') as f:
-        f.write(f"Test Results for {file_name}\n")
-        f.write(f"Timestamp: {test_result.timestamp}\n")
-        f.write(f"Status: {test_result.status}\n")
-        f.write("\nTest Output:\n")
-        f.write(test_result.output)
-        if test_result.error:
-            f.write("\nErrors:\n")
-            f.write(str(test_result.error))
-
-def save_summary(test_results):
-    summary_file = os.path.join(RESULTS_DIR, "summary.txt")
+    # Stamped here rather than at construction, keeping the clock read off
+    # the path that launches the tests
+    ts = test_result.timestamp or timestamp_now()
+    header = [
+        f"Test Results for {file_name}\n",
+        f"Timestamp: {ts}\n",
+        f"Status: {test_result.status}\n",
+    ]
+    counts = test_result.test_counts
+    if counts is not None:
+        header.append(f"Tests: {counts['tests']} run, {counts['failures']} failures, "
+                      f"{counts['errors']} errors, {counts['skipped']} skipped\n")
+    header.append("\nTest Output:\n")
     
-    def is_letter_file(filename):
-        # Check if the filename is a single letter (case insensitive) followed by .java
-        return bool(re.match(r'^[A-Za-z]\.java$', filename))
+    with open(result_file, 'wb') as f:
+        f.write("".join(header).encode())
+        if test_result.log_file:
+            # Copy the Gradle log straight across without decoding it
+            with open(test_result.log_file, 'rb') as log:
+                shutil.copyfileobj(log, f)
+        if test_result.error:
+            f.write(b"\nErrors:\n")
+            f.write(str(test_result.error).encode())
+
+def save_summary(test_results, run_timestamp):
+    # Per bucket: [total, passed, failed, failed_to_run], filled in one pass
+    stats = {bucket: [0, 0, 0, 0] for bucket in ('claude', 'llama', 'other', 'all')}
+    status_slot = {"PASSED": 1, "FAILED": 2, "FAILED_TO_RUN": 3}
+    detailed_lines = []
     
-    def categorize_results(results):
-        claude_tests = []
-        llama_tests = []
+    for result in test_results:
+        file_name = os.path.basename(result.file_name)
         
-        for result in results:
-            file_name = os.path.basename(result.file_name)
-            if is_letter_file(file_name):
-                first_letter = file_name[0].upper()
-                if 'A' <= first_letter <= 'E':
-                    claude_tests.append(result)
-                elif 'F' <= first_letter <= 'J':
-                    llama_tests.append(result)
+        slot = status_slot.get(result.status)
+        for counters in (stats[result.category], stats['all']):
+            counters[0] += 1
+            if slot:
+                counters[slot] += 1
         
-        return claude_tests, llama_tests
+        if result.status == "PASSED":
+            status_icon = "✅"
+        elif result.status == "FAILED":
+            status_icon = "❌"
+        else:  # FAILED_TO_RUN
+            status_icon = "⚠️"
+        detailed_lines.append(f"{status_icon} {file_name}: {result.status}\n")
     
-    def calculate_stats(tests):
-        if not tests:
-            return 0, 0, 0, 0, 0  # total, passed, failed, pass_percent, fail_percent
-        
-        total = len(tests)
-        passed = sum(1 for r in tests if r.status == "PASSED")
-        failed = sum(1 for r in tests if r.status == "FAILED")
-        failed_to_run = sum(1 for r in tests if r.status == "FAILED_TO_RUN")
-        
-        pass_percent = (passed / total) * 100 if total > 0 else 0
-        fail_percent = ((failed + failed_to_run) / total) * 100 if total > 0 else 0
-        
-        return total, passed, failed + failed_to_run, pass_percent, fail_percent
+    def pass_rate(counters):
+        return (counters[1] / counters[0]) * 100 if counters[0] else 0
     
-    claude_tests, llama_tests = categorize_results(test_results)
+    total, passed, failed, failed_to_run = stats['all']
+    c_total, c_passed, c_failed, c_failed_to_run = stats['claude']
+    l_total, l_passed, l_failed, l_failed_to_run = stats['llama']
     
-    with open(summary_file, 'w') as f:
-        f.write("Test Execution Summary\n")
-        f.write("=====================\n\n")
-        f.write(f"Timestamp: {datetime.now()}\n\n")
+    parts = [
+        "Test Execution Summary\n",
+        "=====================\n\n",
+        f"Timestamp: {run_timestamp}\n\n",
         
         # Overall statistics (including all files)
-        total = len(test_results)
-        passed = sum(1 for r in test_results if r.status == "PASSED")
-        failed = sum(1 for r in test_results if r.status == "FAILED")
-        failed_to_run = sum(1 for r in test_results if r.status == "FAILED_TO_RUN")
-        
-        f.write("Overall Results (All Files):\n")
-        f.write("---------------------------\n")
-        f.write(f"Total files tested: {total}\n")
-        f.write(f"Passed: {passed}\n")
-        f.write(f"Failed: {failed}\n")
-        f.write(f"Failed to Run: {failed_to_run}\n\n")
+        "Overall Results (All Files):\n",
+        "---------------------------\n",
+        f"Total files tested: {total}\n",
+        f"Passed: {passed}\n",
+        f"Failed: {failed}\n",
+        f"Failed to Run: {failed_to_run}\n\n",
         
         # Model Comparison Statistics (letter files only)
-        f.write("Model Comparison Statistics (Letter Files Only):\n")
-        f.write("--------------------------------------------\n\n")
+        "Model Comparison Statistics (Letter Files Only):\n",
+        "--------------------------------------------\n\n",
         
         # Claude model statistics (A-E)
-        c_total, c_passed, c_failed, c_pass_pct, c_fail_pct = calculate_stats(claude_tests)
-        f.write("Claude Model Tests (A-E):\n")
-        f.write("------------------------\n")
-        f.write(f"Total tests: {c_total}\n")
-        f.write(f"Passed: {c_passed}\n")
-        f.write(f"Failed/Failed to Run: {c_failed}\n")
-        f.write(f"Pass Rate: {c_pass_pct:.2f}%\n")
+        "Claude Model Tests (A-E):\n",
+        "------------------------\n",
+        f"Total tests: {c_total}\n",
+        f"Passed: {c_passed}\n",
+        f"Failed/Failed to Run: {c_failed + c_failed_to_run}\n",
+        f"Pass Rate: {pass_rate(stats['claude']):.2f}%\n",
         
         # Llama model statistics (F-J)
-        l_total, l_passed, l_failed, l_pass_pct, l_fail_pct = calculate_stats(llama_tests)
-        f.write("Llama Model Tests (F-J):\n")
-        f.write("------------------------\n")
-        f.write(f"Total tests: {l_total}\n")
-        f.write(f"Passed: {l_passed}\n")
-        f.write(f"Failed/Failed to Run: {l_failed}\n")
-        f.write(f"Pass Rate: {l_pass_pct:.2f}%\n")
+        "Llama Model Tests (F-J):\n",
+        "------------------------\n",
+        f"Total tests: {l_total}\n",
+        f"Passed: {l_passed}\n",
+        f"Failed/Failed to Run: {l_failed + l_failed_to_run}\n",
+        f"Pass Rate: {pass_rate(stats['llama']):.2f}%\n",
         
-        f.write("Detailed Results:\n")
-        f.write("----------------\n")
-        for result in test_results:
-            if result.status == "PASSED":
-                status_icon = "✅"
-            elif result.status == "FAILED":
-                status_icon = "❌"
-            else:  # FAILED_TO_RUN
-                status_icon = "⚠️"
-            f.write(f"{status_icon} {os.path.basename(result.file_name)}: {result.status}\n")
-
-def create_build_gradle():
-    gradle_content = """plugins {
+        "Detailed Results:\n",
+        "----------------\n",
+    ]
+    parts.extend(detailed_lines)
+    
+    # Build the report in memory and hand it to the OS in a single write
+    write_report(SUMMARY_FILE, "".join(parts))
+    
+    # Machine-readable copy of the same counters, so tooling doesn't have
+    # to scrape summary.txt
+    summary_json = {
+        bucket: dict(zip(('total', 'passed', 'failed', 'failed_to_run'), counters))
+        for bucket, counters in stats.items()
+    }
+    write_report(SUMMARY_JSON_FILE, json.dumps(summary_json, indent=2))
+
+# Identical for every code file, so it is built once at import time
+BUILD_GRADLE_CONTENT = """plugins {
     id 'java'
     id 'jacoco'
 }
@@ -394,6 +707,13 @@ dependencies {
 test {
     useJUnitPlatform()
     finalizedBy jacocoTestReport
+    // The project is reused across code files, so always rerun the tests:
+    // never up to date, and never restored from the build cache, so even an
+    // identical candidate runs and produces its own test output
+    outputs.upToDateWhen { false }
+    outputs.cacheIf { false }
+    // Results are read from the JUnit XML; the HTML report is never opened
+    reports.html.required = false
 
     testLogging {
         events 'passed', 'skipped', 'failed'
@@ -407,19 +727,51 @@ test {
 jacocoTestReport {
     reports {
         csv.required = true
-        html.required = true
+        html.required = false
     }
 }
 """
-    with open(BUILD_GRADLE_FILE, "w") as f:
-        f.write(gradle_content)
 
-def run_gradle(capture_output=True):
-    subprocess.run(["gradle", "wrapper"], check=True, capture_output=capture_output)
-    result = subprocess.run(["./gradlew", "test", "jacocoTestReport"], 
-                          capture_output=capture_output, text=True)
+# Keep the daemon warm between code files and let the configuration and
+# build caches skip work that is the same for every run; the test task
+# opts out of the build cache in BUILD_GRADLE_CONTENT, so tests always
+# execute. The daemon only compiles and schedules one small project, so a
+# 1g heap is plenty even with PARALLEL_BUILDS of them running side by side.
+GRADLE_PROPERTIES_CONTENT = """org.gradle.daemon=true
+org.gradle.caching=true
+org.gradle.configuration-cache=true
+org.gradle.configuration-cache.problems=warn
+org.gradle.parallel=true
+org.gradle.jvmargs=-Xmx1g -XX:+UseG1GC
+"""
+
+def create_build_gradle(work_dir):
+    with open(os.path.join(work_dir, BUILD_GRADLE_FILE), "w", encoding='utf-8') as f:
+        f.write(BUILD_GRADLE_CONTENT)
+    with open(os.path.join(work_dir, GRADLE_PROPERTIES_FILE), "w", encoding='utf-8') as f:
+        f.write(GRADLE_PROPERTIES_CONTENT)
+
+def create_gradle_wrapper(work_dir):
+    subprocess.run(["gradle", "wrapper"], cwd=work_dir, check=True, capture_output=True)
+
+def run_gradle(work_dir):
+    # The daemon keeps the JVM and dependency resolution warm between code files.
+    # Output goes straight to a log file so large failure traces never sit in memory.
+    with open(os.path.join(work_dir, GRADLE_LOG_FILE), 'wb') as log:
+        result = subprocess.run(["./gradlew", "--daemon", "--console=plain",
+                                 f"--max-workers={BUILD_MAX_WORKERS}",
+                                 "test", "jacocoTestReport"],
+                                cwd=work_dir, stdout=log, stderr=subprocess.STDOUT)
     return result
 
+def stop_gradle_daemon():
+    try:
+        subprocess.run(["gradle", "--stop"], capture_output=True)
+    except OSError:
+        # No gradle on PATH means no daemon was started; don't let this
+        # mask whatever error is already propagating
+        pass
+
 def main():
     print(f"{Colors.GREEN}Starting Java code testing...{Colors.NC}")
     
@@ -433,12 +785,19 @@ def main():
 
     os.makedirs(RESULTS_DIR, exist_ok=True)
 
-    test_results = run_tests()
-    save_summary(test_results)
-    save_coverage_report(test_results)
-
-    print(f"{Colors.GREEN}All tests completed. Results and coverage report saved in {RESULTS_DIR} directory.{Colors.NC}")
-    cleanup()
+    # Stop the daemons even after a crash or Ctrl-C; each one holds its
+    # heap until Gradle's idle timeout otherwise
+    try:
+        test_results = run_tests()
+        # Taken once the tests finish, so it is when the reports were
+        # generated; both describe the same run, so they share it
+        run_timestamp = timestamp_now()
+        save_summary(test_results, run_timestamp)
+        save_coverage_report(test_results, run_timestamp)
+
+        print(f"{Colors.GREEN}All tests completed. Results and coverage report saved in {RESULTS_DIR} directory.{Colors.NC}")
+    finally:
+        stop_gradle_daemon()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file